@@ -1,11 +1,43 @@
 """Command-line interface for chessprompter."""
 
 import click
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from .database import get_connection, init_db, insert_game, list_games, get_game, game_exists
-from .pgn_parser import parse_pgn_file
+from .database import (
+    add_to_player_summary,
+    get_connection,
+    get_game,
+    get_player_stats,
+    init_db,
+    insert_game,
+    iter_export_games,
+    search_games,
+)
+from .dedupe import delete_games, find_duplicate, find_duplicate_groups
+from .pgn_export import open_output, write_pgn
+from .pgn_parser import ParsedGame, parse_pgn_file
 from .player import play_game
+from .server import DEFAULT_HOST, DEFAULT_POOL_SIZE, DEFAULT_PORT, find_service, serve as run_service
+
+# Number of games parsed ahead and inserted per transaction by `load`
+LOAD_BATCH_SIZE = 500
+
+
+def _is_served(ctx: click.Context, action: str) -> bool:
+    """Report and return True if a running service holds the database."""
+    if find_service(ctx.obj["db_path"]):
+        click.echo(f"The database is being served read-only. Stop 'chessprompter serve' to {action}.", err=True)
+        return True
+    return False
+
+
+def _batched(games: Iterable[ParsedGame], size: int) -> Iterator[list[ParsedGame]]:
+    """Group games into lists of at most `size`, pulling lazily from `games`."""
+    iterator = iter(games)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 @click.group()
@@ -34,6 +66,9 @@ def load(ctx: click.Context, pgn_files: tuple[Path, ...]) -> None:
         click.echo("No PGN files specified.", err=True)
         return
 
+    if _is_served(ctx, "load games"):
+        return
+
     conn = get_connection(ctx.obj["db_path"])
     init_db(conn)
 
@@ -43,26 +78,49 @@ def load(ctx: click.Context, pgn_files: tuple[Path, ...]) -> None:
         click.echo(f"Loading {pgn_path}...")
         count = 0
         skipped = 0
-        for game in parse_pgn_file(pgn_path):
-            moves_str = ",".join(game.moves)
-            if game_exists(conn, game.white, game.black, moves_str):
-                click.echo(f"  Skipping duplicate: {game.white} vs {game.black}")
-                skipped += 1
-                continue
-            insert_game(
-                conn,
-                white=game.white,
-                black=game.black,
-                white_players=game.white_players,
-                black_players=game.black_players,
-                is_consultation=game.is_consultation,
-                year=game.year,
-                event=game.event,
-                result=game.result,
-                eco=game.eco,
-                moves=moves_str,
-            )
-            count += 1
+        # Parsing is pulled one batch at a time, so at most LOAD_BATCH_SIZE
+        # games are held in memory regardless of the file size.
+        for batch in _batched(parse_pgn_file(pgn_path), LOAD_BATCH_SIZE):
+            conn.begin()
+            try:
+                inserted = []
+                for game in batch:
+                    duplicate_id = find_duplicate(
+                        conn,
+                        game.white_players,
+                        game.black_players,
+                        game.year,
+                        game.result,
+                        game.event,
+                        game.ply_count,
+                        game.signature,
+                    )
+                    if duplicate_id is not None:
+                        click.echo(f"  Skipping duplicate of game {duplicate_id}: {game.white} vs {game.black}")
+                        skipped += 1
+                        continue
+                    game_id = insert_game(
+                        conn,
+                        white=game.white,
+                        black=game.black,
+                        white_players=game.white_players,
+                        black_players=game.black_players,
+                        is_consultation=game.is_consultation,
+                        year=game.year,
+                        event=game.event,
+                        result=game.result,
+                        eco=game.eco,
+                        moves=game.moves,
+                        signature=game.signature,
+                        summarize=False,
+                    )
+                    inserted.append(game_id)
+                    count += 1
+                add_to_player_summary(conn, inserted)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
         click.echo(f"  Loaded {count} game(s), skipped {skipped} duplicate(s)")
         total_loaded += count
         total_skipped += skipped
@@ -71,18 +129,72 @@ def load(ctx: click.Context, pgn_files: tuple[Path, ...]) -> None:
     click.echo(f"Total: {total_loaded} game(s) loaded, {total_skipped} duplicate(s) skipped")
 
 
-@main.command(name="list")
+@main.command()
+@click.option("--dry-run", is_flag=True, help="Report duplicates without deleting them.")
 @click.pass_context
-def list_cmd(ctx: click.Context) -> None:
-    """List all loaded games."""
+def dedupe(ctx: click.Context, dry_run: bool) -> None:
+    """Find and remove near-duplicate games.
+
+    Of each group of duplicates the longest game with a known result is kept.
+    """
+    if _is_served(ctx, "remove duplicates"):
+        return
+
     conn = get_connection(ctx.obj["db_path"])
     init_db(conn)
 
-    games = list_games(conn)
+    groups = find_duplicate_groups(conn)
+    if not groups:
+        conn.close()
+        click.echo("No duplicates found.")
+        return
+
+    for kept_id, duplicate_ids in groups:
+        duplicates_str = ", ".join(str(game_id) for game_id in duplicate_ids)
+        click.echo(f"  Game {kept_id}: duplicates {duplicates_str}")
+
+    total = sum(len(duplicate_ids) for _, duplicate_ids in groups)
+    if dry_run:
+        conn.close()
+        click.echo(f"Total: {total} duplicate(s) found")
+        return
+
+    delete_games(conn, [game_id for _, duplicate_ids in groups for game_id in duplicate_ids])
     conn.close()
+    click.echo(f"Total: {total} duplicate(s) removed")
+
+
+@main.command(name="list")
+@click.option("--player", default=None, help="Only games with a player matching this name.")
+@click.option("--eco", default=None, help="Only games whose ECO code starts with this prefix.")
+@click.option("--year-from", type=int, default=None, help="Only games played in or after this year.")
+@click.option("--year-to", type=int, default=None, help="Only games played in or before this year.")
+@click.option("--result", default=None, help="Only games with this result (e.g. 1-0).")
+@click.pass_context
+def list_cmd(
+    ctx: click.Context,
+    player: str | None,
+    eco: str | None,
+    year_from: int | None,
+    year_to: int | None,
+    result: str | None,
+) -> None:
+    """List loaded games, optionally filtered."""
+    filters = dict(player=player, eco=eco, year_from=year_from, year_to=year_to, result=result)
+    service = find_service(ctx.obj["db_path"])
+    if service:
+        games = service.search_games(**filters)
+    else:
+        conn = get_connection(ctx.obj["db_path"])
+        init_db(conn)
+        games = search_games(conn, **filters)
+        conn.close()
 
     if not games:
-        click.echo("No games loaded. Use 'chessprompter load <pgn_file>' to load games.")
+        if any(value is not None for value in filters.values()):
+            click.echo("No matching games.")
+        else:
+            click.echo("No games loaded. Use 'chessprompter load <pgn_file>' to load games.")
         return
 
     click.echo(f"{'ID':<6} {'White':<25} {'Black':<25} {'Year':<6} {'Result':<10} {'ECO'}")
@@ -105,11 +217,14 @@ def play(ctx: click.Context, game_id: int) -> None:
 
     Use 'n' to go forward, 'b' to go back, 'q' to quit.
     """
-    conn = get_connection(ctx.obj["db_path"])
-    init_db(conn)
-
-    game = get_game(conn, game_id)
-    conn.close()
+    service = find_service(ctx.obj["db_path"])
+    if service:
+        game = service.get_game(game_id)
+    else:
+        conn = get_connection(ctx.obj["db_path"])
+        init_db(conn)
+        game = get_game(conn, game_id)
+        conn.close()
 
     if not game:
         click.echo(f"Game with ID {game_id} not found.", err=True)
@@ -125,5 +240,104 @@ def play(ctx: click.Context, game_id: int) -> None:
     play_game(white, black, year, event, result, moves, is_consultation)
 
 
+@main.command()
+@click.argument("player")
+@click.pass_context
+def stats(ctx: click.Context, player: str) -> None:
+    """Show win/draw/loss statistics for players matching PLAYER."""
+    service = find_service(ctx.obj["db_path"])
+    if service:
+        summaries = service.get_player_stats(player)
+    else:
+        conn = get_connection(ctx.obj["db_path"])
+        init_db(conn)
+        summaries = get_player_stats(conn, player)
+        conn.close()
+
+    if not summaries:
+        click.echo(f"No games found for player '{player}'.", err=True)
+        return
+
+    for display_name, rows in summaries:
+        by_side: dict[str, list[int]] = {}
+        by_eco: dict[str, list[int]] = {}
+        for side, eco, *counts in rows:
+            for totals in (by_side.setdefault(side.capitalize(), [0] * 4), by_eco.setdefault(eco, [0] * 4)):
+                for i, n in enumerate(counts):
+                    totals[i] += n
+
+        click.echo(f"\n{display_name}")
+        _echo_record_table("Color", list(by_side.items()) + [("Total", [sum(c) for c in zip(*by_side.values())])])
+        if set(by_eco) != {"?"}:
+            _echo_record_table("ECO", [(eco if eco != "?" else "-", by_eco[eco]) for eco in sorted(by_eco)])
+
+
+def _echo_record_table(title: str, lines: list[tuple[str, list[int]]]) -> None:
+    """Print labelled (games, wins, draws, losses) rows with a score column."""
+    click.echo(f"  {title:<8} {'Games':>6} {'Wins':>6} {'Draws':>6} {'Losses':>6} {'Score':>7}")
+    click.echo("  " + "-" * 44)
+    for label, (games, wins, draws, losses) in lines:
+        decided = wins + draws + losses
+        score = f"{100 * (wins + draws / 2) / decided:.1f}%" if decided else "-"
+        click.echo(f"  {label:<8} {games:>6} {wins:>6} {draws:>6} {losses:>6} {score:>7}")
+
+
+@main.command(name="export-pgn")
+@click.option("--player", default=None, help="Only games with a player matching this name.")
+@click.option("--eco", default=None, help="Only games whose ECO code starts with this prefix.")
+@click.option("--year-from", type=int, default=None, help="Only games played in or after this year.")
+@click.option("--year-to", type=int, default=None, help="Only games played in or before this year.")
+@click.option("--result", default=None, help="Only games with this result (e.g. 1-0).")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Output file (default: stdout). Compressed if it ends in .gz, .bz2 or .xz.",
+)
+@click.pass_context
+def export_pgn(
+    ctx: click.Context,
+    player: str | None,
+    eco: str | None,
+    year_from: int | None,
+    year_to: int | None,
+    result: str | None,
+    output: Path | None,
+) -> None:
+    """Export games as PGN, optionally filtered."""
+    filters = dict(player=player, eco=eco, year_from=year_from, year_to=year_to, result=result)
+    service = find_service(ctx.obj["db_path"])
+    if service:
+        with open_output(output) as out:
+            count = service.export_pgn(out, **filters)
+    else:
+        conn = get_connection(ctx.obj["db_path"])
+        init_db(conn)
+        with open_output(output) as out:
+            count = write_pgn(iter_export_games(conn, **filters), out)
+        conn.close()
+
+    if output is not None:
+        click.echo(f"Exported {count} game(s) to {output}")
+
+
+@main.command()
+@click.option("--host", default=DEFAULT_HOST, show_default=True, help="Address to listen on.")
+@click.option("--port", type=int, default=DEFAULT_PORT, show_default=True, help="Port to listen on.")
+@click.option("--pool-size", type=int, default=DEFAULT_POOL_SIZE, show_default=True,
+              help="Number of read-only cursors serving queries.")
+@click.pass_context
+def serve(ctx: click.Context, host: str, port: int, pool_size: int) -> None:
+    """Serve the database read-only to other tools over HTTP.
+
+    While the service runs, 'list', 'play', 'stats' and 'export-pgn' query
+    it instead of opening the database. Loading games and removing
+    duplicates require stopping it first.
+    """
+    click.echo(f"Serving on http://{host}:{port} (Ctrl+C to stop)")
+    run_service(ctx.obj["db_path"], host, port, pool_size)
+
+
 if __name__ == "__main__":
     main()
@@ -3,17 +3,26 @@
 import re
 import duckdb
 from pathlib import Path
+from typing import Iterator
 
+from chessprompter.pgn_parser import position_signature
 from chessprompter.schema import ALL_DDL
 
 DEFAULT_DB_PATH = Path.home() / ".chessprompter" / "games.duckdb"
 
 
-def get_connection(db_path: Path | None = None) -> duckdb.DuckDBPyConnection:
+def sql_int_list(values: list[int], sql_type: str = "INTEGER") -> str:
+    """Format integers as a comma-separated list of typed SQL literals."""
+    # Inlined because the DuckDB client converts every bound value separately,
+    # which costs more than the queries themselves when loading games
+    return ", ".join(f"{int(value)}::{sql_type}" for value in values)
+
+
+def get_connection(db_path: Path | None = None, read_only: bool = False) -> duckdb.DuckDBPyConnection:
     """Get a connection to the DuckDB database."""
     path = db_path or DEFAULT_DB_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
-    return duckdb.connect(str(path))
+    return duckdb.connect(str(path), read_only=read_only)
 
 
 def parse_player_name(name: str) -> dict:
@@ -156,6 +165,32 @@ def migrate_schema(conn: duckdb.DuckDBPyConnection) -> None:
             [white_display, black_display, is_consultation, game_id]
         )
 
+    # Backfill position signatures for games loaded before duplicate detection
+    games_needing_signatures = conn.execute(
+        """
+        SELECT g.game_id, g.moves
+        FROM fact_games g
+        WHERE NOT EXISTS (SELECT 1 FROM game_signatures s WHERE s.game_id = g.game_id)
+        """
+    ).fetchall()
+
+    for game_id, moves_str in games_needing_signatures:
+        moves = moves_str.split(",") if moves_str else []
+        _insert_signature(conn, game_id, len(moves), position_signature(moves))
+
+    # Rebuild the player summary if it does not count every game_players row,
+    # as for games loaded before it was maintained
+    summarized, bridged = conn.execute(
+        """
+        SELECT
+            (SELECT COALESCE(SUM(games), 0) FROM player_summary),
+            (SELECT COUNT(*) FROM game_players)
+        """
+    ).fetchone()
+    if summarized != bridged:
+        conn.execute("DELETE FROM player_summary")
+        _apply_player_summary(conn, "TRUE", [])
+
 
 def init_db(conn: duckdb.DuckDBPyConnection) -> None:
     """Initialize the database schema."""
@@ -209,6 +244,69 @@ def _insert_game_player(
     )
 
 
+def _insert_signature(
+    conn: duckdb.DuckDBPyConnection,
+    game_id: int,
+    ply_count: int,
+    signature: list[int],
+) -> None:
+    """Insert the trailing position hashes of a game, the last one being final."""
+    first_ply = ply_count - len(signature) + 1
+    last = len(signature) - 1
+    # One statement with literal rows is far cheaper than executemany
+    rows = ", ".join(
+        f"({int(game_id)}, {first_ply + i}, {int(h)}::UBIGINT, {i == last})"
+        for i, h in enumerate(signature)
+    )
+    conn.execute(f"INSERT INTO game_signatures (game_id, ply, position_hash, is_final) VALUES {rows}")
+
+
+def _apply_player_summary(conn: duckdb.DuckDBPyConnection, condition: str, params: list) -> None:
+    """Add the game_players rows matching condition to the player summary.
+
+    Outcomes are counted for every individual player of a side.
+    """
+    conn.execute(
+        f"""
+        INSERT INTO player_summary (player_id, side, eco, games, wins, draws, losses)
+        SELECT
+            gp.player_id,
+            gp.side,
+            COALESCE(g.eco, '?'),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE r.result = CASE gp.side WHEN 'white' THEN '1-0' ELSE '0-1' END),
+            COUNT(*) FILTER (WHERE r.result = '1/2-1/2'),
+            COUNT(*) FILTER (WHERE r.result = CASE gp.side WHEN 'white' THEN '0-1' ELSE '1-0' END)
+        FROM game_players gp
+        JOIN fact_games g ON gp.game_id = g.game_id
+        JOIN dim_result r ON g.result_id = r.result_id
+        WHERE {condition}
+        GROUP BY gp.player_id, gp.side, COALESCE(g.eco, '?')
+        ON CONFLICT (player_id, side, eco) DO UPDATE SET
+            games = player_summary.games + excluded.games,
+            wins = player_summary.wins + excluded.wins,
+            draws = player_summary.draws + excluded.draws,
+            losses = player_summary.losses + excluded.losses
+        """,
+        params,
+    )
+
+
+def add_to_player_summary(conn: duckdb.DuckDBPyConnection, game_ids: list[int]) -> None:
+    """Add games inserted with summarize=False to the player summary."""
+    if game_ids:
+        _apply_player_summary(conn, f"gp.game_id IN ({sql_int_list(game_ids)})", [])
+
+
+def refresh_player_summary(conn: duckdb.DuckDBPyConnection, player_ids: list[int]) -> None:
+    """Recompute the summary rows of the given players from game_players."""
+    if not player_ids:
+        return
+    ids = sql_int_list(player_ids)
+    conn.execute(f"DELETE FROM player_summary WHERE player_id IN ({ids})")
+    _apply_player_summary(conn, f"gp.player_id IN ({ids})", [])
+
+
 def _get_or_create_date(conn: duckdb.DuckDBPyConnection, year: int | None) -> int:
     """Get or create a date entry and return its ID."""
     row = conn.execute(
@@ -276,8 +374,15 @@ def insert_game(
     result: str | None,
     eco: str | None,
     moves: str,
+    signature: list[int] | None = None,
+    summarize: bool = True,
 ) -> int:
-    """Insert a game into the database and return its ID."""
+    """Insert a game into the database and return its ID.
+
+    If no position signature is given it is computed by replaying the moves.
+    Updating the player summary is a comparatively slow upsert; bulk loaders
+    pass summarize=False and call add_to_player_summary once per batch.
+    """
     # Create player record for the original name (for backwards compatibility)
     white_id = _get_or_create_player(conn, white)
     black_id = _get_or_create_player(conn, black)
@@ -312,6 +417,13 @@ def insert_game(
         player_id = _get_or_create_player(conn, player_name)
         _insert_game_player(conn, game_id, player_id, "black", i)
 
+    ply_count = moves.count(",") + 1 if moves else 0
+    if signature is None:
+        signature = position_signature(moves.split(",") if moves else [])
+    _insert_signature(conn, game_id, ply_count, signature)
+    if summarize:
+        add_to_player_summary(conn, [game_id])
+
     return game_id
 
 
@@ -335,19 +447,165 @@ def list_games(conn: duckdb.DuckDBPyConnection) -> list[tuple]:
     ).fetchall()
 
 
-def game_exists(conn: duckdb.DuckDBPyConnection, white: str, black: str, moves: str) -> bool:
-    """Check if a game with the same players and moves already exists."""
-    row = conn.execute(
-        """
-        SELECT 1 FROM fact_games g
+def _game_filters(
+    player: str | None = None,
+    eco: str | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    result: str | None = None,
+) -> tuple[str, list]:
+    """Build the WHERE clause and parameters shared by game queries.
+
+    Expects fact_games, dim_date and dim_result aliased as g, d and r.
+    """
+    conditions = []
+    params: list = []
+    if player:
+        conditions.append(
+            """
+            g.game_id IN (
+                SELECT gp.game_id FROM game_players gp
+                JOIN dim_player p ON gp.player_id = p.player_id
+                WHERE p.name ILIKE ? OR p.display_name ILIKE ?
+            )
+            """
+        )
+        params.extend([f"%{player}%", f"%{player}%"])
+    if eco:
+        conditions.append("g.eco LIKE ?")
+        params.append(f"{eco}%")
+    if year_from is not None:
+        conditions.append("d.year >= ?")
+        params.append(year_from)
+    if year_to is not None:
+        conditions.append("d.year <= ?")
+        params.append(year_to)
+    if result:
+        conditions.append("r.result = ?")
+        params.append(result)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def search_games(
+    conn: duckdb.DuckDBPyConnection,
+    player: str | None = None,
+    eco: str | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    result: str | None = None,
+) -> list[tuple]:
+    """List games matching the given filters, with the same columns as list_games.
+
+    The player filter matches any individual player of either side,
+    case-insensitively and on both the raw and the display name.
+    """
+    where, params = _game_filters(player, eco, year_from, year_to, result)
+    return conn.execute(
+        f"""
+        SELECT
+            g.game_id,
+            g.white_display AS white,
+            g.black_display AS black,
+            d.year,
+            r.result,
+            g.eco,
+            g.is_consultation
+        FROM fact_games g
+        JOIN dim_date d ON g.date_id = d.date_id
+        JOIN dim_result r ON g.result_id = r.result_id
+        {where}
+        ORDER BY g.game_id ASC
+        """,
+        params,
+    ).fetchall()
+
+
+def iter_export_games(
+    conn: duckdb.DuckDBPyConnection,
+    player: str | None = None,
+    eco: str | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    result: str | None = None,
+    batch_size: int = 10000,
+) -> Iterator[tuple]:
+    """Yield games matching the given filters with everything needed for PGN.
+
+    Rows are (game_id, event, year, white, black, result, eco, moves), where
+    white and black join the individual players of each side with " & ".
+    All games come from a single query, fetched batch_size rows at a time.
+    """
+    where, params = _game_filters(player, eco, year_from, year_to, result)
+    rows = conn.execute(
+        f"""
+        WITH sides AS (
+            SELECT
+                gp.game_id,
+                string_agg(p.name, ' & ' ORDER BY gp.position) FILTER (WHERE gp.side = 'white') AS white,
+                string_agg(p.name, ' & ' ORDER BY gp.position) FILTER (WHERE gp.side = 'black') AS black
+            FROM game_players gp
+            JOIN dim_player p ON gp.player_id = p.player_id
+            GROUP BY gp.game_id
+        )
+        SELECT
+            g.game_id,
+            e.name AS event,
+            d.year,
+            COALESCE(s.white, pw.name) AS white,
+            COALESCE(s.black, pb.name) AS black,
+            r.result,
+            g.eco,
+            g.moves
+        FROM fact_games g
+        JOIN dim_date d ON g.date_id = d.date_id
+        JOIN dim_event e ON g.event_id = e.event_id
+        JOIN dim_result r ON g.result_id = r.result_id
         JOIN dim_player pw ON g.playing_white_id = pw.player_id
         JOIN dim_player pb ON g.playing_black_id = pb.player_id
-        WHERE pw.name = ? AND pb.name = ? AND g.moves = ?
-        LIMIT 1
+        LEFT JOIN sides s ON g.game_id = s.game_id
+        {where}
+        ORDER BY g.game_id ASC
         """,
-        [white, black, moves],
-    ).fetchone()
-    return row is not None
+        params,
+    )
+    while batch := rows.fetchmany(batch_size):
+        yield from batch
+
+
+def find_players(conn: duckdb.DuckDBPyConnection, name: str) -> list[tuple]:
+    """Find players with at least one game whose name matches, as (player_id, display_name)."""
+    return conn.execute(
+        """
+        SELECT p.player_id, p.display_name
+        FROM dim_player p
+        WHERE (p.name ILIKE ? OR p.display_name ILIKE ?)
+          AND EXISTS (SELECT 1 FROM player_summary s WHERE s.player_id = p.player_id)
+        ORDER BY p.display_name ASC, p.player_id ASC
+        """,
+        [f"%{name}%", f"%{name}%"],
+    ).fetchall()
+
+
+def get_player_summary(conn: duckdb.DuckDBPyConnection, player_id: int) -> list[tuple]:
+    """Get a player's record as (side, eco, games, wins, draws, losses) rows."""
+    return conn.execute(
+        """
+        SELECT side, eco, games, wins, draws, losses
+        FROM player_summary
+        WHERE player_id = ?
+        ORDER BY side DESC, eco ASC
+        """,
+        [player_id],
+    ).fetchall()
+
+
+def get_player_stats(conn: duckdb.DuckDBPyConnection, name: str) -> list[tuple[str, list[tuple]]]:
+    """Get (display_name, summary rows) for every player matching name."""
+    return [
+        (display_name, get_player_summary(conn, player_id))
+        for player_id, display_name in find_players(conn, name)
+    ]
 
 
 def get_game(conn: duckdb.DuckDBPyConnection, game_id: int) -> tuple | None:
@@ -0,0 +1,339 @@
+"""Near-duplicate game detection for chessprompter.
+
+Candidates are blocked on a position hash shared at the same ply by two games
+of the same year: either both games end in the same position (transpositions
+and byte-different copies) or one game ends in a position the other passes
+through in its last SIGNATURE_PLIES plies (truncated copies). Blocked
+candidates are then confirmed by comparing normalized player names, results
+and events. Positions before MIN_PLIES are never blocked on: very short games
+such as forfeits share them en masse and carry no evidence of being copies.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+import duckdb
+
+from chessprompter.database import parse_player_name, refresh_player_summary, sql_int_list
+
+# Minimum similarity ratio for two names to be considered the same spelling
+NAME_SIMILARITY = 0.8
+
+# Minimum ply of a position blocked on, so that short games are never matched
+MIN_PLIES = 10
+
+# Players of each side for the games selected by {game_ids}
+_GAME_SIDES_SQL = """
+SELECT
+    gp.game_id,
+    list(p.name ORDER BY gp.position) FILTER (WHERE gp.side = 'white') AS white_players,
+    list(p.name ORDER BY gp.position) FILTER (WHERE gp.side = 'black') AS black_players
+FROM game_players gp
+JOIN dim_player p ON gp.player_id = p.player_id
+WHERE gp.game_id IN ({game_ids})
+GROUP BY gp.game_id
+"""
+
+
+def _fold(text: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w]+", " ", text.lower()).split())
+
+
+def normalize_player_name(name: str) -> tuple[str, list[str]]:
+    """Normalize a player name into a (surname, given names) pair.
+
+    Both "Anderssen, Adolf" and "Adolf Anderssen" normalize to
+    ("anderssen", ["adolf"]).
+    """
+    tokens = _fold(parse_player_name(name)["display_name"]).split()
+    if not tokens:
+        return "", []
+    return tokens[-1], tokens[:-1]
+
+
+def _similar(a: str, b: str) -> bool:
+    """Check if two normalized names are the same up to a small spelling difference."""
+    return a == b or SequenceMatcher(None, a, b).ratio() >= NAME_SIMILARITY
+
+
+def names_match(a: str, b: str) -> bool:
+    """Check if two player names plausibly refer to the same player.
+
+    Surnames must be near-identical. Given names, when both are known, must
+    share their initial, and be near-identical unless one is only an initial.
+    """
+    surname_a, given_a = normalize_player_name(a)
+    surname_b, given_b = normalize_player_name(b)
+    if not _similar(surname_a, surname_b):
+        return False
+    if not given_a or not given_b:
+        return True
+    first_a, first_b = given_a[0], given_b[0]
+    if first_a[0] != first_b[0]:
+        return False
+    return len(first_a) == 1 or len(first_b) == 1 or _similar(first_a, first_b)
+
+
+def sides_match(a: list[str], b: list[str]) -> bool:
+    """Check if two lists of players on one side match in any order."""
+    if len(a) != len(b):
+        return False
+    remaining = list(b)
+    for name in a:
+        for i, other in enumerate(remaining):
+            if names_match(name, other):
+                del remaining[i]
+                break
+        else:
+            return False
+    return True
+
+
+def players_match(
+    white_a: list[str],
+    black_a: list[str],
+    white_b: list[str],
+    black_b: list[str],
+) -> bool:
+    """Check if two games were played by the same players with the same colors."""
+    return sides_match(white_a, white_b) and sides_match(black_a, black_b)
+
+
+def _known(value: str | None) -> bool:
+    """Check if a result or event header carries information."""
+    return value not in (None, "", "?", "*")
+
+
+def games_match(
+    white_a: list[str],
+    black_a: list[str],
+    result_a: str | None,
+    event_a: str | None,
+    white_b: list[str],
+    black_b: list[str],
+    result_b: str | None,
+    event_b: str | None,
+) -> bool:
+    """Check if two games sharing a position signature are the same game.
+
+    Players must match, results must agree unless one is unknown, and events
+    must agree when both are known. Two games of a match that follow the same
+    opening but end differently are therefore kept apart.
+    """
+    if _known(result_a) and _known(result_b) and result_a != result_b:
+        return False
+    if _known(event_a) and _known(event_b) and _fold(event_a) != _fold(event_b):
+        return False
+    return players_match(white_a, black_a, white_b, black_b)
+
+
+def find_duplicate(
+    conn: duckdb.DuckDBPyConnection,
+    white_players: list[str],
+    black_players: list[str],
+    year: int | None,
+    result: str | None,
+    event: str | None,
+    ply_count: int,
+    signature: list[int],
+) -> int | None:
+    """Return the ID of a stored game that duplicates the given one, if any.
+
+    Signature rows are probed by hash alone and the few candidates are then
+    looked up by ID, so the cost does not grow with the size of the database.
+    """
+    if ply_count < MIN_PLIES:
+        return None
+    first_ply = ply_count - len(signature) + 1
+    last = len(signature) - 1
+    positions = {
+        (first_ply + i, h): i == last
+        for i, h in enumerate(signature)
+        if first_ply + i >= MIN_PLIES
+    }
+
+    # Typed as UBIGINT so the column is not widened, which would force a full scan
+    hashes = sql_int_list([h for _, h in positions], "UBIGINT")
+    signature_rows = conn.execute(
+        f"""
+        SELECT game_id, ply, position_hash, is_final
+        FROM game_signatures
+        WHERE position_hash IN ({hashes}) AND ply >= {MIN_PLIES}
+        """
+    ).fetchall()
+    candidate_ids = sorted({
+        game_id
+        for game_id, ply, position_hash, is_final in signature_rows
+        if (ply, position_hash) in positions and (is_final or positions[(ply, position_hash)])
+    })
+    if not candidate_ids:
+        return None
+
+    ids = sql_int_list(candidate_ids)
+    games = conn.execute(
+        f"""
+        SELECT g.game_id, r.result, e.name
+        FROM fact_games g
+        JOIN dim_date d ON g.date_id = d.date_id
+        JOIN dim_result r ON g.result_id = r.result_id
+        JOIN dim_event e ON g.event_id = e.event_id
+        WHERE g.game_id IN ({ids}) AND d.year IS NOT DISTINCT FROM ?
+        ORDER BY g.game_id ASC
+        """,
+        [year],
+    ).fetchall()
+    if not games:
+        return None
+    sides = {
+        game_id: (white_b or [], black_b or [])
+        for game_id, white_b, black_b in conn.execute(_GAME_SIDES_SQL.format(game_ids=ids)).fetchall()
+    }
+
+    for game_id, result_b, event_b in games:
+        white_b, black_b = sides.get(game_id, ([], []))
+        if games_match(white_players, black_players, result, event, white_b, black_b, result_b, event_b):
+            return game_id
+    return None
+
+
+def find_duplicate_groups(
+    conn: duckdb.DuckDBPyConnection, batch_size: int = 10000
+) -> list[tuple[int, list[int]]]:
+    """Find groups of duplicate games across the whole database.
+
+    Candidate pairs come from a single hash join on (position hash, ply, year),
+    so the work grows with the number of games rather than the number of pairs
+    of games. Returns (kept game ID, duplicate IDs) tuples; of each group the
+    longest game with a known result is kept, ties going to the oldest ID.
+    """
+    result = conn.execute(
+        f"""
+        WITH sig AS (
+            SELECT s.game_id, s.ply, s.position_hash, s.is_final, d.year
+            FROM game_signatures s
+            JOIN fact_games g ON s.game_id = g.game_id
+            JOIN dim_date d ON g.date_id = d.date_id
+            WHERE s.ply >= {MIN_PLIES}
+        ),
+        final AS (
+            SELECT game_id, ply FROM game_signatures WHERE is_final
+        ),
+        pairs AS (
+            SELECT a.game_id AS a_id, b.game_id AS b_id
+            FROM sig a
+            JOIN sig b
+                ON a.position_hash = b.position_hash
+                AND a.ply = b.ply
+                AND a.year IS NOT DISTINCT FROM b.year
+                AND a.game_id <> b.game_id
+            WHERE a.is_final AND (NOT b.is_final OR a.game_id < b.game_id)
+        ),
+        info AS (
+            SELECT g.game_id, f.ply, r.result, e.name AS event
+            FROM fact_games g
+            JOIN final f ON g.game_id = f.game_id
+            JOIN dim_result r ON g.result_id = r.result_id
+            JOIN dim_event e ON g.event_id = e.event_id
+            WHERE g.game_id IN (SELECT a_id FROM pairs UNION SELECT b_id FROM pairs)
+        ),
+        sides AS ({_GAME_SIDES_SQL.format(game_ids="SELECT game_id FROM info")})
+        SELECT
+            p.a_id, ia.ply, sa.white_players, sa.black_players, ia.result, ia.event,
+            p.b_id, ib.ply, sb.white_players, sb.black_players, ib.result, ib.event
+        FROM pairs p
+        JOIN info ia ON p.a_id = ia.game_id
+        JOIN info ib ON p.b_id = ib.game_id
+        JOIN sides sa ON p.a_id = sa.game_id
+        JOIN sides sb ON p.b_id = sb.game_id
+        """
+    )
+
+    parent: dict[int, int] = {}
+    plies: dict[int, int] = {}
+    decided: dict[int, bool] = {}
+    # Known result and event of each group, keyed by its root
+    headers: dict[int, tuple[str | None, str | None]] = {}
+
+    def find(game_id: int) -> int:
+        root = parent.setdefault(game_id, game_id)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    def merge_header(a: str | None, b: str | None) -> tuple[bool, str | None]:
+        if not _known(a):
+            return True, b
+        if not _known(b):
+            return True, a
+        return _fold(a) == _fold(b), a
+
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            break
+        for a_id, a_ply, white_a, black_a, result_a, event_a, b_id, b_ply, white_b, black_b, result_b, event_b in rows:
+            if not games_match(
+                white_a or [], black_a or [], result_a, event_a,
+                white_b or [], black_b or [], result_b, event_b,
+            ):
+                continue
+            root_a, root_b = find(a_id), find(b_id)
+            if root_a == root_b:
+                continue
+            headers.setdefault(root_a, (result_a, event_a))
+            headers.setdefault(root_b, (result_b, event_b))
+            # A game with unknown headers must not chain two conflicting games together
+            results_ok, merged_result = merge_header(headers[root_a][0], headers[root_b][0])
+            events_ok, merged_event = merge_header(headers[root_a][1], headers[root_b][1])
+            if not (results_ok and events_ok):
+                continue
+            plies[a_id] = a_ply
+            plies[b_id] = b_ply
+            decided[a_id] = _known(result_a)
+            decided[b_id] = _known(result_b)
+            root, child = min(root_a, root_b), max(root_a, root_b)
+            parent[child] = root
+            headers[root] = (merged_result, merged_event)
+
+    groups: dict[int, list[int]] = {}
+    for game_id in plies:
+        groups.setdefault(find(game_id), []).append(game_id)
+
+    duplicates = []
+    for members in groups.values():
+        members.sort(key=lambda game_id: (not decided[game_id], -plies[game_id], game_id))
+        duplicates.append((members[0], sorted(members[1:])))
+    duplicates.sort()
+    return duplicates
+
+
+def delete_games(conn: duckdb.DuckDBPyConnection, game_ids: list[int]) -> None:
+    """Delete games together with their bridge, signature and summary rows.
+
+    DuckDB rejects deleting a row and the rows referencing it in the same
+    transaction, so the dependent rows go first, together with recomputing
+    the affected player summaries, and the games themselves last. If the final
+    step fails the summary still matches game_players.
+    """
+    if not game_ids:
+        return
+    ids = sql_int_list(game_ids)
+    conn.begin()
+    try:
+        player_ids = [
+            row[0]
+            for row in conn.execute(f"SELECT DISTINCT player_id FROM game_players WHERE game_id IN ({ids})").fetchall()
+        ]
+        for table in ("game_signatures", "game_players"):
+            conn.execute(f"DELETE FROM {table} WHERE game_id IN ({ids})")
+        refresh_player_summary(conn, player_ids)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    conn.execute(f"DELETE FROM fact_games WHERE game_id IN ({ids})")
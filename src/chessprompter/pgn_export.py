@@ -0,0 +1,99 @@
+"""PGN export utilities."""
+
+import bz2
+import gzip
+import lzma
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import IO, ContextManager, Iterable
+
+# Compressed output formats, chosen by the output file suffix
+_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+# Maximum movetext line length
+MOVETEXT_WIDTH = 80
+
+# Bytes buffered before writing to the output
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _escape(value: str) -> str:
+    """Escape backslashes and quotes in a PGN tag value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def format_movetext(moves: list[str], result: str) -> str:
+    """Format SAN moves as numbered PGN movetext ending with the result.
+
+    Lines are wrapped at MOVETEXT_WIDTH, keeping move numbers with their move.
+    """
+    units = [
+        f"{i // 2 + 1}. {san}" if i % 2 == 0 else san
+        for i, san in enumerate(moves)
+    ]
+    units.append(result)
+
+    lines = []
+    line = units[0]
+    for unit in units[1:]:
+        if len(line) + 1 + len(unit) > MOVETEXT_WIDTH:
+            lines.append(line)
+            line = unit
+        else:
+            line = f"{line} {unit}"
+    lines.append(line)
+    return "\n".join(lines)
+
+
+def format_game(
+    event: str | None,
+    year: int | None,
+    white: str,
+    black: str,
+    result: str | None,
+    eco: str | None,
+    moves: str,
+) -> str:
+    """Format a stored game as a PGN record, moves given comma-separated."""
+    result = result or "*"
+    date = f"{year}.??.??" if year else "????.??.??"
+    headers = [
+        ("Event", event or "?"),
+        ("Site", "?"),
+        ("Date", date),
+        ("Round", "?"),
+        ("White", white),
+        ("Black", black),
+        ("Result", result),
+    ]
+    if eco:
+        headers.append(("ECO", eco))
+
+    tag_pairs = "\n".join(f'[{name} "{_escape(value)}"]' for name, value in headers)
+    movetext = format_movetext(moves.split(",") if moves else [], result)
+    return f"{tag_pairs}\n\n{movetext}\n\n"
+
+
+def open_output(path: Path | None) -> ContextManager[IO[str]]:
+    """Open the export destination, compressing by file suffix; stdout if no path."""
+    if path is None:
+        # Left open on exit, as it is not ours to close
+        return nullcontext(sys.stdout)
+    opener = _OPENERS.get(path.suffix)
+    if opener:
+        return opener(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+
+
+def write_pgn(rows: Iterable[tuple], out: IO[str]) -> int:
+    """Write games as rows from iter_export_games and return how many were written."""
+    count = 0
+    for _, event, year, white, black, result, eco, moves in rows:
+        out.write(format_game(event, year, white, black, result, eco, moves))
+        count += 1
+    return count
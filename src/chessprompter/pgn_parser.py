@@ -1,11 +1,17 @@
 """PGN file parsing utilities."""
 
 import re
+import chess
 import chess.pgn
+import chess.polyglot
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
 from dataclasses import dataclass
 
+# Number of trailing positions (besides the final one) kept per game so that
+# truncated copies of a game can still be matched against the full version.
+SIGNATURE_PLIES = 8
+
 
 def detect_consultation_players(name: str) -> list[str]:
     """Detect and split consultation players from a player name string.
@@ -18,9 +24,43 @@ def detect_consultation_players(name: str) -> list[str]:
     return [p.strip() for p in players if p.strip()]
 
 
-@dataclass
+def position_signature(moves: Iterable[str]) -> list[int]:
+    """Replay SAN moves from the initial position and return the signature.
+
+    The signature holds the Zobrist hashes of the last SIGNATURE_PLIES + 1
+    positions, ending with the final position. Games whose moves cannot be
+    replayed are signed up to the last legal move.
+    """
+    board = chess.Board()
+    for san in moves:
+        try:
+            board.push_san(san)
+        except ValueError:
+            break
+    return _board_signature(board)
+
+
+def _board_signature(board: chess.Board) -> list[int]:
+    """Return the signature of the game played on board, taking back its last moves.
+
+    Only the trailing positions are hashed, which is much cheaper than hashing
+    every position while the game is replayed.
+    """
+    hashes = [chess.polyglot.zobrist_hash(board)]
+    for _ in range(min(SIGNATURE_PLIES, len(board.move_stack))):
+        board.pop()
+        hashes.append(chess.polyglot.zobrist_hash(board))
+    hashes.reverse()
+    return hashes
+
+
+@dataclass(slots=True)
 class ParsedGame:
-    """A parsed chess game."""
+    """A parsed chess game.
+
+    Moves are kept as a single comma-separated SAN string, the format they are
+    stored in.
+    """
 
     white: str
     black: str
@@ -31,7 +71,9 @@ class ParsedGame:
     event: str | None
     result: str | None
     eco: str | None
-    moves: list[str]
+    moves: str
+    ply_count: int
+    signature: list[int]
 
 
 def parse_pgn_file(pgn_path: Path) -> Iterator[ParsedGame]:
@@ -87,5 +129,7 @@ def parse_pgn_file(pgn_path: Path) -> Iterator[ParsedGame]:
                 event=event,
                 result=result,
                 eco=eco,
-                moves=moves,
+                moves=",".join(moves),
+                ply_count=len(moves),
+                signature=_board_signature(board),
             )
@@ -70,5 +70,44 @@ CREATE TABLE IF NOT EXISTS game_players (
 );
 """
 
+GAME_SIGNATURES_DDL = """
+CREATE TABLE IF NOT EXISTS game_signatures (
+    game_id INTEGER NOT NULL,
+    ply INTEGER NOT NULL,
+    position_hash UBIGINT NOT NULL,
+    is_final BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (game_id, ply),
+    FOREIGN KEY (game_id) REFERENCES fact_games(game_id)
+);
+"""
+
+GAME_SIGNATURES_INDEX_DDL = """
+CREATE INDEX IF NOT EXISTS idx_game_signatures_hash ON game_signatures (position_hash);
+"""
+
+PLAYER_SUMMARY_DDL = """
+CREATE TABLE IF NOT EXISTS player_summary (
+    player_id INTEGER NOT NULL,
+    side TEXT NOT NULL CHECK (side IN ('white', 'black')),
+    eco TEXT NOT NULL,
+    games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, side, eco),
+    FOREIGN KEY (player_id) REFERENCES dim_player(player_id)
+);
+"""
+
 # Order for table creation (dimensions before fact)
-ALL_DDL = [DIM_PLAYER_DDL, DIM_DATE_DDL, DIM_EVENT_DDL, DIM_RESULT_DDL, FACT_GAMES_DDL, GAME_PLAYERS_DDL]
\ No newline at end of file
+ALL_DDL = [
+    DIM_PLAYER_DDL,
+    DIM_DATE_DDL,
+    DIM_EVENT_DDL,
+    DIM_RESULT_DDL,
+    FACT_GAMES_DDL,
+    GAME_PLAYERS_DDL,
+    GAME_SIGNATURES_DDL,
+    GAME_SIGNATURES_INDEX_DDL,
+    PLAYER_SUMMARY_DDL,
+]
\ No newline at end of file
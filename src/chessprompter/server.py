@@ -0,0 +1,259 @@
+"""Local read-only query service for chessprompter.
+
+DuckDB allows a single process to hold a database file. `chessprompter serve`
+opens it once in read-only mode and answers queries from a pool of cursors
+over HTTP, so several readers can share it. The service advertises its URL in
+a file next to the database, which the CLI uses to find it.
+"""
+
+import io
+import json
+import os
+import queue
+import signal
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import IO, Iterator
+
+import duckdb
+
+from chessprompter.database import (
+    DEFAULT_DB_PATH,
+    get_connection,
+    get_game,
+    get_player_stats,
+    init_db,
+    iter_export_games,
+    search_games,
+)
+from chessprompter.pgn_export import write_pgn
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_POOL_SIZE = 8
+
+# Seconds to wait for a running service to answer a health check
+HEALTH_TIMEOUT = 2.0
+
+_SEARCH_PARAMS = {
+    "player": str,
+    "eco": str,
+    "year_from": int,
+    "year_to": int,
+    "result": str,
+}
+
+
+def service_file(db_path: Path | None = None) -> Path:
+    """Return the path of the file advertising the service for a database."""
+    path = db_path or DEFAULT_DB_PATH
+    return path.with_name(path.name + ".serve")
+
+
+class CursorPool:
+    """A fixed-size pool of cursors over one read-only connection."""
+
+    def __init__(self, db_path: Path | None, size: int = DEFAULT_POOL_SIZE):
+        self.conn = get_connection(db_path, read_only=True)
+        self._cursors: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self._cursors.put(self.conn.cursor())
+
+    @contextmanager
+    def acquire(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a cursor, waiting for one to be returned if all are in use."""
+        cursor = self._cursors.get()
+        try:
+            yield cursor
+        finally:
+            self._cursors.put(cursor)
+
+    def close(self) -> None:
+        """Close all cursors and the underlying connection."""
+        while not self._cursors.empty():
+            self._cursors.get().close()
+        self.conn.close()
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Serve the query endpoints.
+
+    /health, /games (optionally filtered), /games/<id> and /players?name=
+    answer JSON; /export (optionally filtered) streams PGN text.
+    """
+
+    pool: CursorPool
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok"})
+        elif parts == ["games"]:
+            filters = self._filters(url.query)
+            if filters is None:
+                return
+            with self.pool.acquire() as cursor:
+                games = search_games(cursor, **filters)
+            self._send_json(200, games)
+        elif parts == ["export"]:
+            filters = self._filters(url.query)
+            if filters is None:
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-chess-pgn; charset=utf-8")
+            self.end_headers()
+            # Without a Content-Length the body ends when the connection closes
+            out = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=False)
+            with self.pool.acquire() as cursor:
+                write_pgn(iter_export_games(cursor, **filters), out)
+            out.flush()
+            out.detach()
+        elif parts == ["players"]:
+            name = urllib.parse.parse_qs(url.query).get("name", [""])[0]
+            if not name:
+                self._send_json(400, {"error": "Missing player name"})
+                return
+            with self.pool.acquire() as cursor:
+                players = get_player_stats(cursor, name)
+            self._send_json(200, players)
+        elif len(parts) == 2 and parts[0] == "games" and parts[1].isdigit():
+            with self.pool.acquire() as cursor:
+                game = get_game(cursor, int(parts[1]))
+            if game is None:
+                self._send_json(404, {"error": f"Game with ID {parts[1]} not found"})
+            else:
+                self._send_json(200, game)
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _filters(self, query_string: str) -> dict | None:
+        """Parse search filters from a query string, answering 400 if invalid."""
+        query = urllib.parse.parse_qs(query_string)
+        try:
+            return {
+                name: convert(query[name][0])
+                for name, convert in _SEARCH_PARAMS.items()
+                if name in query
+            }
+        except ValueError:
+            self._send_json(400, {"error": "Invalid filter value"})
+            return None
+
+    def _send_json(self, status: int, payload: object) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Silence per-request logging."""
+
+
+def make_server(pool: CursorPool, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Create an HTTP server answering queries from the given cursor pool."""
+    handler = type("BoundQueryHandler", (QueryHandler,), {"pool": pool})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(
+    db_path: Path | None = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    pool_size: int = DEFAULT_POOL_SIZE,
+) -> None:
+    """Run the query service until interrupted."""
+    # Make sure the schema exists before switching to read-only mode
+    conn = get_connection(db_path)
+    init_db(conn)
+    conn.close()
+
+    pool = CursorPool(db_path, pool_size)
+    server = make_server(pool, host, port)
+
+    advert = service_file(db_path)
+    bound_host, bound_port = server.server_address[:2]
+    advert.write_text(json.dumps({"url": f"http://{bound_host}:{bound_port}", "pid": os.getpid()}))
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        advert.unlink(missing_ok=True)
+
+
+class ServiceClient:
+    """Client for a running query service, mirroring the database functions."""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def _get(self, path: str, timeout: float | None = None) -> object:
+        with urllib.request.urlopen(self.url + path, timeout=timeout) as response:
+            return json.loads(response.read())
+
+    def _query(self, path: str, **params) -> str:
+        query = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
+        return f"{path}?{query}" if query else path
+
+    def search_games(self, **filters) -> list[tuple]:
+        """List games matching the given filters."""
+        return [tuple(row) for row in self._get(self._query("/games", **filters))]
+
+    def list_games(self) -> list[tuple]:
+        """List all games."""
+        return self.search_games()
+
+    def get_game(self, game_id: int) -> tuple | None:
+        """Get a game by its ID."""
+        try:
+            return tuple(self._get(f"/games/{game_id}"))
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+    def get_player_stats(self, name: str) -> list[tuple[str, list[tuple]]]:
+        """Get (display_name, summary rows) for every player matching name."""
+        return [
+            (display_name, [tuple(row) for row in rows])
+            for display_name, rows in self._get(self._query("/players", name=name))
+        ]
+
+    def export_pgn(self, out: IO[str], **filters) -> int:
+        """Write games matching the given filters as PGN and return how many were written."""
+        count = 0
+        url = self.url + self._query("/export", **filters)
+        with urllib.request.urlopen(url) as response:
+            for line in io.TextIOWrapper(response, encoding="utf-8"):
+                if line.startswith("[Event "):
+                    count += 1
+                out.write(line)
+        return count
+
+
+def find_service(db_path: Path | None = None) -> ServiceClient | None:
+    """Return a client for the service running over a database, if any."""
+    try:
+        url = json.loads(service_file(db_path).read_text())["url"]
+    except (OSError, ValueError, KeyError):
+        return None
+    client = ServiceClient(url)
+    try:
+        client._get("/health", timeout=HEALTH_TIMEOUT)
+    except (OSError, ValueError):
+        return None
+    return client
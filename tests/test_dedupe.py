@@ -0,0 +1,142 @@
+"""Tests for near-duplicate game detection."""
+
+import pytest
+
+from chessprompter.database import get_connection, init_db, insert_game
+from chessprompter.dedupe import MIN_PLIES, delete_games, find_duplicate, find_duplicate_groups, names_match
+from chessprompter.pgn_parser import detect_consultation_players, position_signature
+
+MATCH_OPENING = ["d4", "d5", "c4", "c6", "Nc3", "Nf6", "e3", "e6", "Nf3", "Nbd7", "Bd3", "Bd6", "O-O", "O-O"]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = get_connection(tmp_path / "games.duckdb")
+    init_db(conn)
+    yield conn
+    conn.close()
+
+
+def add_game(conn, white, black, moves, year=1886, event="World Championship", result="1-0"):
+    white_players = detect_consultation_players(white)
+    black_players = detect_consultation_players(black)
+    return insert_game(
+        conn,
+        white=white,
+        black=black,
+        white_players=white_players,
+        black_players=black_players,
+        is_consultation=len(white_players) > 1 or len(black_players) > 1,
+        year=year,
+        event=event,
+        result=result,
+        eco=None,
+        moves=",".join(moves),
+    )
+
+
+def lookup(conn, white, black, moves, year=1886, event="World Championship", result="1-0"):
+    return find_duplicate(
+        conn,
+        detect_consultation_players(white),
+        detect_consultation_players(black),
+        year,
+        result,
+        event,
+        len(moves),
+        position_signature(moves),
+    )
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("Anderssen, Adolf", "Adolf Anderssen"),
+        ("Anderssen, Adolf", "Anderssen, A."),
+        ("Anderssen, Adolf", "Andersen, Adolf"),
+        ("Zukertort, Johannes", "Zukertort"),
+        ("Réti, Richard", "Reti, Richard"),
+    ],
+)
+def test_names_match_spelling_variants(a, b):
+    assert names_match(a, b)
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("Anderssen, Adolf", "Kieseritzky, Lionel"),
+        ("Lasker, Emanuel", "Lasker, Edward"),
+    ],
+)
+def test_names_match_rejects_different_players(a, b):
+    assert not names_match(a, b)
+
+
+def test_find_duplicate_with_different_name_spelling(conn):
+    game_id = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING)
+    assert lookup(conn, "W. Steinitz", "Zukertort, J.", MATCH_OPENING) == game_id
+
+
+def test_find_duplicate_with_truncated_moves(conn):
+    game_id = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING)
+    assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING[:-1], result=None) == game_id
+    assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING[:-4]) == game_id
+
+
+def test_find_duplicate_with_transposed_moves(conn):
+    game_id = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING)
+    transposed = ["d4", "d5", "c4", "c6", "e3", "Nf6", "Nc3", "e6", *MATCH_OPENING[8:]]
+    assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", transposed) == game_id
+
+
+def test_find_duplicate_rejects_other_players_or_year(conn):
+    add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING)
+    assert lookup(conn, "Steinitz, Wilhelm", "Chigorin, Mikhail", MATCH_OPENING) is None
+    assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING, year=1887) is None
+
+
+def test_find_duplicate_keeps_games_with_different_results(conn):
+    add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING[:10], result="1/2-1/2")
+    assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING, result="1-0") is None
+
+
+def test_find_duplicate_keeps_games_from_different_events(conn):
+    add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING, event="London")
+    assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING, event="Vienna") is None
+    assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING, event=None) is not None
+
+
+def test_short_games_are_never_duplicates(conn):
+    for moves in ([], MATCH_OPENING[:MIN_PLIES - 1]):
+        add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", moves)
+        add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", moves)
+        assert lookup(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", moves) is None
+    assert find_duplicate_groups(conn) == []
+
+
+def test_find_duplicate_groups_keeps_longest_game(conn):
+    full = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING)
+    truncated = add_game(conn, "W. Steinitz", "Zukertort, J.", MATCH_OPENING[:-2])
+    assert find_duplicate_groups(conn) == [(full, [truncated])]
+
+
+def test_find_duplicate_groups_does_not_chain_conflicting_results(conn):
+    draw = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING[:8], result="1/2-1/2")
+    win = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING, result="1-0")
+    unknown = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING[:11], result=None)
+
+    groups = find_duplicate_groups(conn)
+    removed = [game_id for _, duplicate_ids in groups for game_id in duplicate_ids]
+    assert removed == [unknown]
+    assert draw not in removed and win not in removed
+
+
+def test_delete_games_updates_player_summary(conn):
+    full = add_game(conn, "Steinitz, Wilhelm", "Zukertort, Johannes", MATCH_OPENING)
+    truncated = add_game(conn, "Steinitz, W.", "Zukertort, Johannes", MATCH_OPENING[:-2])
+
+    delete_games(conn, [truncated])
+
+    assert conn.execute("SELECT game_id FROM fact_games").fetchall() == [(full,)]
+    assert conn.execute("SELECT SUM(games), SUM(wins), SUM(losses) FROM player_summary").fetchone() == (2, 1, 1)
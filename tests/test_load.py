@@ -0,0 +1,81 @@
+"""Tests for loading PGN files in batches."""
+
+from click.testing import CliRunner
+
+from chessprompter import cli
+from chessprompter.database import get_connection
+
+PGN = """\
+[Event "Immortal Game"]
+[Date "1851.06.21"]
+[White "Anderssen, Adolf"]
+[Black "Kieseritzky, Lionel"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 3. Bc4 Qh4+ 4. Kf1 b5 5. Bxb5 Nf6 6. Nf3 Qh6 7. d3 Nh5 1-0
+
+[Event "Opera Game"]
+[Date "1858.??.??"]
+[White "Morphy, Paul"]
+[Black "Duke of Brunswick and Count Isouard"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 1-0
+
+[Event "Immortal Game"]
+[Date "1851.??.??"]
+[White "Anderssen, A."]
+[Black "Kieseritzky, Lionel"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 3. Bc4 Qh4+ 4. Kf1 b5 5. Bxb5 Nf6 6. Nf3 Qh6 7. d3 Nh5 1-0
+
+[Event "London"]
+[Date "1862.??.??"]
+[White "Anderssen, Adolf"]
+[Black "Steinitz, Wilhelm"]
+[Result "0-1"]
+
+1. d4 d5 2. c4 e6 3. Nc3 Nf6 4. Bg5 Be7 5. e3 O-O 0-1
+
+[Event "London"]
+[Date "1862.??.??"]
+[White "Steinitz, Wilhelm"]
+[Black "Anderssen, Adolf"]
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 3. d4 cxd4 4. Nxd4 Nf6 5. Nc3 a6 1/2-1/2
+"""
+
+
+def test_batched_pulls_games_lazily():
+    pulled = []
+
+    def games():
+        for i in range(5):
+            pulled.append(i)
+            yield i
+
+    batches = cli._batched(games(), 2)
+    assert next(batches) == [0, 1]
+    assert pulled == [0, 1]
+    assert list(batches) == [[2, 3], [4]]
+
+
+def test_load_in_batches_skips_duplicates_across_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "LOAD_BATCH_SIZE", 2)
+    pgn_path = tmp_path / "games.pgn"
+    pgn_path.write_text(PGN, encoding="utf-8")
+    db_path = tmp_path / "games.duckdb"
+
+    result = CliRunner().invoke(cli.main, ["--db", str(db_path), "load", str(pgn_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "Skipping duplicate of game 1" in result.output
+    assert "Total: 4 game(s) loaded, 1 duplicate(s) skipped" in result.output
+
+    conn = get_connection(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM fact_games").fetchone() == (4,)
+    # Every loaded batch is added to the player summary
+    assert conn.execute("SELECT SUM(games) FROM player_summary").fetchone() == (9,)
+    conn.close()
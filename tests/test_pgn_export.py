@@ -0,0 +1,114 @@
+"""Tests for PGN export."""
+
+import gzip
+
+import pytest
+from click.testing import CliRunner
+
+from chessprompter.cli import main
+from chessprompter.database import get_connection, init_db, insert_game, iter_export_games
+from chessprompter.pgn_export import MOVETEXT_WIDTH, format_game, format_movetext, open_output
+from chessprompter.pgn_parser import detect_consultation_players, parse_pgn_file
+
+IMMORTAL_GAME = (
+    "e4,e5,f4,exf4,Bc4,Qh4+,Kf1,b5,Bxb5,Nf6,Nf3,Qh6,d3,Nh5,Nh4,Qg5,Nf5,c6,g4,Nf6,Rg1,cxb5,"
+    "h4,Qg6,h5,Qg5,Qf3,Ng8,Bxf4,Qf6,Nc3,Bc5,Nd5,Qxb2,Bd6,Bxg1,e5,Qxa1+,Ke2,Na6,Nxg7+,Kd8,Qf6+,Nxf6,Be7#"
+)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = get_connection(tmp_path / "games.duckdb")
+    init_db(conn)
+    yield conn
+    conn.close()
+
+
+def add_game(conn, white, black, year, event, result, eco, moves):
+    white_players = detect_consultation_players(white)
+    black_players = detect_consultation_players(black)
+    return insert_game(
+        conn,
+        white=white,
+        black=black,
+        white_players=white_players,
+        black_players=black_players,
+        is_consultation=len(white_players) > 1 or len(black_players) > 1,
+        year=year,
+        event=event,
+        result=result,
+        eco=eco,
+        moves=moves,
+    )
+
+
+def test_format_movetext_numbers_moves_and_appends_result():
+    assert format_movetext(["e4", "e5", "Nf3"], "*") == "1. e4 e5 2. Nf3 *"
+    assert format_movetext([], "1-0") == "1-0"
+
+
+def test_format_movetext_wraps_lines_keeping_move_numbers():
+    lines = format_movetext(IMMORTAL_GAME.split(","), "1-0").splitlines()
+    assert len(lines) > 1
+    assert all(len(line) <= MOVETEXT_WIDTH for line in lines)
+    assert not any(line.endswith(".") for line in lines)
+
+
+def test_format_game_headers():
+    pgn = format_game(None, None, 'Smith, "Jr"', "Doe", None, None, "e4")
+    assert '[Event "?"]' in pgn
+    assert '[Date "????.??.??"]' in pgn
+    assert '[White "Smith, \\"Jr\\""]' in pgn
+    assert '[Result "*"]' in pgn
+    assert "[ECO" not in pgn
+    assert pgn.endswith("1. e4 *\n\n")
+
+
+def test_export_round_trips_through_parser(tmp_path):
+    path = tmp_path / "games.pgn.gz"
+    with open_output(path) as out:
+        out.write(format_game("Immortal Game", 1851, "Anderssen, Adolf", "Kieseritzky, Lionel", "1-0", "C33", IMMORTAL_GAME))
+        out.write(format_game("Opera Game", 1858, "Morphy, Paul", "Duke of Brunswick & Count Isouard", "1-0", None, "e4,e5"))
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert f.read().startswith('[Event "Immortal Game"]')
+
+    plain = tmp_path / "games.pgn"
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        plain.write_text(f.read(), encoding="utf-8")
+    immortal, opera = parse_pgn_file(plain)
+
+    assert (immortal.white, immortal.year, immortal.result, immortal.eco) == ("Anderssen, Adolf", 1851, "1-0", "C33")
+    assert immortal.moves == IMMORTAL_GAME
+    assert opera.black_players == ["Duke of Brunswick", "Count Isouard"]
+    assert opera.is_consultation
+
+
+def test_iter_export_games_rebuilds_sides_and_filters(conn):
+    immortal = add_game(conn, "Anderssen, Adolf", "Kieseritzky, Lionel", 1851, "Immortal Game", "1-0", "C33", IMMORTAL_GAME)
+    opera = add_game(conn, "Morphy, Paul", "Duke of Brunswick and Count Isouard", 1858, None, "1-0", "C41", "e4,e5")
+    draw = add_game(conn, "Steinitz, Wilhelm", "Anderssen, Adolf", 1866, "London", None, None, "d4,d5")
+
+    rows = list(iter_export_games(conn, batch_size=1))
+    assert [row[0] for row in rows] == [immortal, opera, draw]
+    assert rows[1] == (opera, None, 1858, "Morphy, Paul", "Duke of Brunswick & Count Isouard", "1-0", "C41", "e4,e5")
+    assert rows[2][5] == "*"
+
+    def exported(**filters):
+        return [row[0] for row in iter_export_games(conn, **filters)]
+
+    assert exported(player="anderssen") == [immortal, draw]
+    assert exported(player="Isouard") == [opera]
+    assert exported(eco="C4") == [opera]
+    assert exported(year_from=1855, year_to=1860) == [opera]
+    assert exported(result="1-0", player="Anderssen") == [immortal]
+
+
+def test_export_pgn_command_writes_to_stdout(tmp_path, conn):
+    add_game(conn, "Anderssen, Adolf", "Kieseritzky, Lionel", 1851, "Immortal Game", "1-0", "C33", IMMORTAL_GAME)
+    conn.close()
+
+    result = CliRunner().invoke(main, ["--db", str(tmp_path / "games.duckdb"), "export-pgn"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith('[Event "Immortal Game"]')
@@ -0,0 +1,115 @@
+"""Tests for the local query service."""
+
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from chessprompter.database import get_connection, init_db, insert_game
+from chessprompter.pgn_parser import detect_consultation_players
+from chessprompter import server as server_module
+from chessprompter.server import CursorPool, ServiceClient, find_service, make_server, service_file
+
+GAMES = [
+    ("Anderssen, Adolf", "Kieseritzky, Lionel", 1851, "Immortal Game", "1-0", "C33", "e4,e5,f4,exf4,Bc4,Qh4+"),
+    ("Morphy, Paul", "Duke of Brunswick & Count Isouard", 1858, "Opera Game", "1-0", "C41", "e4,e5,Nf3,d6"),
+    ("Steinitz, Wilhelm", "Anderssen, Adolf", 1866, "London", "1/2-1/2", None, "d4,d5"),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "games.duckdb"
+    conn = get_connection(path)
+    init_db(conn)
+    for white, black, year, event, result, eco, moves in GAMES:
+        white_players = detect_consultation_players(white)
+        black_players = detect_consultation_players(black)
+        insert_game(
+            conn,
+            white=white,
+            black=black,
+            white_players=white_players,
+            black_players=black_players,
+            is_consultation=len(white_players) > 1 or len(black_players) > 1,
+            year=year,
+            event=event,
+            result=result,
+            eco=eco,
+            moves=moves,
+        )
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def client(db_path):
+    pool = CursorPool(db_path, size=2)
+    server = make_server(pool, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield ServiceClient(f"http://{host}:{port}")
+    server.shutdown()
+    server.server_close()
+    pool.close()
+
+
+def test_search_games_applies_filters(client):
+    assert [game[0] for game in client.search_games()] == [1, 2, 3]
+    assert [game[0] for game in client.search_games(player="Anderssen")] == [1, 3]
+    assert [game[0] for game in client.search_games(player="Anderssen", year_from=1860)] == [3]
+    assert client.search_games(eco="B") == []
+
+
+def test_slow_query_outlasts_health_timeout(client, monkeypatch):
+    search_games = server_module.search_games
+
+    def slow_search_games(*args, **kwargs):
+        time.sleep(0.3)
+        return search_games(*args, **kwargs)
+
+    monkeypatch.setattr(server_module, "HEALTH_TIMEOUT", 0.1)
+    monkeypatch.setattr(server_module, "search_games", slow_search_games)
+    assert len(client.search_games()) == 3
+
+
+def test_invalid_filter_is_rejected(client):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(f"{client.url}/games?year_from=1850s")
+    assert excinfo.value.code == 400
+    assert json.loads(excinfo.value.read()) == {"error": "Invalid filter value"}
+
+
+def test_get_game_and_unknown_paths(client):
+    game = client.get_game(2)
+    assert game[1:3] == ("Paul Morphy", "Duke of Brunswick & Count Isouard")
+    assert client.get_game(99) is None
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        urllib.request.urlopen(f"{client.url}/nowhere")
+    assert excinfo.value.code == 404
+
+
+def test_player_stats(client):
+    [(name, rows)] = client.get_player_stats("Anderssen")
+    assert name == "Adolf Anderssen"
+    assert sorted(rows) == [("black", "?", 1, 0, 1, 0), ("white", "C33", 1, 1, 0, 0)]
+
+
+def test_export_streams_pgn(client):
+    out = io.StringIO()
+    assert client.export_pgn(out, player="Anderssen") == 2
+    pgn = out.getvalue()
+    assert pgn.count("[Event ") == 2
+    assert '[White "Anderssen, Adolf"]' in pgn
+    assert "1. e4 e5 2. f4 exf4 3. Bc4 Qh4+ 1-0" in pgn
+
+
+def test_find_service_reads_advert(client, db_path):
+    assert find_service(db_path) is None
+    service_file(db_path).write_text(json.dumps({"url": client.url, "pid": 0}))
+    assert find_service(db_path).url == client.url
@@ -0,0 +1,116 @@
+"""Tests for the maintained player summary and the stats command."""
+
+import pytest
+from click.testing import CliRunner
+
+from chessprompter.cli import main
+from chessprompter.database import (
+    add_to_player_summary,
+    get_connection,
+    get_player_stats,
+    init_db,
+    insert_game,
+)
+from chessprompter.pgn_parser import detect_consultation_players
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = get_connection(tmp_path / "games.duckdb")
+    init_db(conn)
+    yield conn
+    conn.close()
+
+
+def add_game(conn, white, black, result, eco=None, summarize=True):
+    white_players = detect_consultation_players(white)
+    black_players = detect_consultation_players(black)
+    return insert_game(
+        conn,
+        white=white,
+        black=black,
+        white_players=white_players,
+        black_players=black_players,
+        is_consultation=len(white_players) > 1 or len(black_players) > 1,
+        year=1858,
+        event=None,
+        result=result,
+        eco=eco,
+        moves="e4,e5",
+        summarize=summarize,
+    )
+
+
+def add_games(conn, summarize=True):
+    return [
+        add_game(conn, "Morphy, Paul", "Anderssen, Adolf", "1-0", "C52", summarize),
+        add_game(conn, "Morphy, Paul", "Anderssen, Adolf", "1/2-1/2", "C52", summarize),
+        add_game(conn, "Anderssen, Adolf", "Morphy, Paul", "1-0", None, summarize),
+        add_game(conn, "Morphy, Paul", "Duke of Brunswick and Count Isouard", "1-0", "C41", summarize),
+        add_game(conn, "Morphy, Paul", "Harrwitz, Daniel", None, "C41", summarize),
+    ]
+
+
+def summary(conn):
+    return conn.execute("SELECT * FROM player_summary ORDER BY ALL").fetchall()
+
+
+def test_player_stats_by_color_and_opening(conn):
+    add_games(conn)
+
+    assert get_player_stats(conn, "Morphy") == [
+        (
+            "Paul Morphy",
+            [
+                ("white", "C41", 2, 1, 0, 0),
+                ("white", "C52", 2, 1, 1, 0),
+                ("black", "?", 1, 0, 0, 1),
+            ],
+        )
+    ]
+    [(_, anderssen)] = get_player_stats(conn, "anderssen")
+    assert anderssen == [("white", "?", 1, 1, 0, 0), ("black", "C52", 2, 0, 1, 1)]
+
+
+def test_each_consultation_player_is_credited(conn):
+    add_games(conn)
+
+    assert get_player_stats(conn, "Brunswick") == [("Duke of Brunswick", [("black", "C41", 1, 0, 0, 1)])]
+    assert get_player_stats(conn, "Isouard") == [("Count Isouard", [("black", "C41", 1, 0, 0, 1)])]
+
+
+def test_batched_summary_matches_incremental(conn, tmp_path):
+    add_games(conn)
+    incremental = summary(conn)
+
+    batched_conn = get_connection(tmp_path / "batched.duckdb")
+    init_db(batched_conn)
+    game_ids = add_games(batched_conn, summarize=False)
+    assert summary(batched_conn) == []
+    add_to_player_summary(batched_conn, game_ids)
+    assert summary(batched_conn) == incremental
+    batched_conn.close()
+
+
+def test_init_db_rebuilds_summary_that_does_not_match(conn):
+    add_games(conn)
+    expected = summary(conn)
+
+    conn.execute("DELETE FROM player_summary WHERE side = 'black'")
+    init_db(conn)
+    assert summary(conn) == expected
+
+
+def test_stats_command(conn, tmp_path):
+    add_games(conn)
+    conn.close()
+    runner = CliRunner()
+    db = str(tmp_path / "games.duckdb")
+
+    result = runner.invoke(main, ["--db", db, "stats", "Morphy"])
+    assert result.exit_code == 0, result.output
+    assert "Paul Morphy" in result.output
+    assert "  Total         5      2      1      1   62.5%" in result.output
+
+    result = runner.invoke(main, ["--db", db, "stats", "Lasker"])
+    assert "No games found for player 'Lasker'." in result.output